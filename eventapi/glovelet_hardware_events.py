@@ -9,24 +9,50 @@ from glovelet.sensorapi.sensorstream import SensorStream
 from glovelet.sensorapi.glovelet_sensormonitor import GloveletBNO055IMUSensorMonitor, GloveletFlexSensorMonitor
 
 
+# Maximum number of buffered samples consumed by a dispatcher before it creates its events.
+MAX_SAMPLE_BATCH = 16
+
+
 class GloveletImuEvent(Event):
-    def __init__(self, accel, orient, accel_elapsed, accel_timestamp, orient_timestamp):
-        self.acceleration = accel[:]
-        self.orientation = orient[:]
-        self.motion_elapsed = accel_elapsed[:]
-        self.motion_timestamp = accel_timestamp[:]
-        self.orient_timestamp = orient_timestamp[:]
+    def __init__(self, accel, orient, accel_elapsed, accel_timestamp, orient_timestamp, copy=True):
+        """
+        :param copy: When `True`, each series is extracted into a new array in sequential order, which is
+        required when the event is sent to another process. When `False`, the series objects are referenced
+        directly, which avoids the copies for listeners running in the same process.
+        """
+        if copy:
+            accel, orient = accel[:], orient[:]
+            accel_elapsed, accel_timestamp, orient_timestamp = accel_elapsed[:], accel_timestamp[:], orient_timestamp[:]
+        self.acceleration = accel
+        self.orientation = orient
+        self.motion_elapsed = accel_elapsed
+        self.motion_timestamp = accel_timestamp
+        self.orient_timestamp = orient_timestamp
 
 
 class GloveletFlexEvent(Event):
     def __init__(self, data, tstamps, time_elapsed):
-        self.index = data[:, 0]
-        self.middle = data[:, 1]
-        self.thumb0 = data[:, 2]
-        self.thumb1 = data[:, 3]
+        # extract the series once; finger accessors below are O(1) column views of it.
+        self._data = data[:]
         self.tstamps = tstamps
         self.time_elapsed = time_elapsed
 
+    @property
+    def index(self):
+        return self._data[:, 0]
+
+    @property
+    def middle(self):
+        return self._data[:, 1]
+
+    @property
+    def thumb0(self):
+        return self._data[:, 2]
+
+    @property
+    def thumb1(self):
+        return self._data[:, 3]
+
 
 class GloveletImuEventDispatcher(EventDispatcher):
     def __init__(self, port, baud, acc_series_sz=50, rot_series_sz=5):
@@ -43,13 +69,13 @@ class GloveletImuEventDispatcher(EventDispatcher):
                                                      rot_series_sz=self.__rot_series_sz)
         self.__stream.register_monitor(imu_monitor)
         self.__stream.open()
-        while not self.__stream.is_open():
-            continue
+        if not self.__stream.wait_open(timeout=5.0):
+            raise TimeoutError('SensorStream connection timeout.')
         return (imu_monitor,), {}
 
     def update(self, imu_monitor):
         if self.__stream.is_open():
-            self.__stream.update()
+            self.__stream.drain(MAX_SAMPLE_BATCH)
             imu_event = GloveletImuEvent(imu_monitor.acceleration_sequence,
                                          imu_monitor.velocity_sequence,
                                          imu_monitor.orientation_timeseries,
@@ -90,13 +116,13 @@ class GloveletSensorEventDispatcher(EventDispatcher):
         stream.register_monitor(flex_monitor)
         stream.open()
         # Wait for stream to open.
-        while not stream.is_open():
-            continue
+        if not stream.wait_open(timeout=5.0):
+            raise TimeoutError('SensorStream connection timeout.')
         return (stream, imu_monitor, flex_monitor), {}
 
     def update(self, stream, imu_monitor, flex_monitor):
         if stream.is_open():
-            stream.update()
+            stream.drain(MAX_SAMPLE_BATCH)
             imu_event = GloveletImuEvent(imu_monitor.acceleration_sequence,
                                          imu_monitor.orientation_timeseries,
                                          imu_monitor.accel_time_elapsed,
@@ -118,40 +144,86 @@ class GloveletSensorListener(EventListener):
         self.accel = None
         self.velocity = None
         self.orientation = None
-        self.flex_index = None
-        self.flex_middle = None
-        self.flex_thumb0 = None
-        self.flex_thumb1 = None
+        self._flex_event = None
 
     def on_imu_event(self, event):
         self.acceleration = event.acceleration
         self.velocity = event.velocity
         self.orientation = event.orientation
 
+    @property
+    def flex_index(self):
+        return self._flex_event.index if self._flex_event is not None else None
+
+    @property
+    def flex_middle(self):
+        return self._flex_event.middle if self._flex_event is not None else None
+
+    @property
+    def flex_thumb0(self):
+        return self._flex_event.thumb0 if self._flex_event is not None else None
+
+    @property
+    def flex_thumb1(self):
+        return self._flex_event.thumb1 if self._flex_event is not None else None
+
     def on_flex_event(self, event):
-        self.flex_index = event.data[:, 0]
-        self.flex_middle = event.data[:, 1]
-        self.flex_thumb0 = event.data[:, 2]
-        self.flex_thumb1 = event.data[:, 3]
+        self._flex_event = event
 
 
 class GloveletImuEventFlipped(Event):
     def __init__(self, accel, vel, orient, accel_elapsed):
-        self.accel_x = np.flip(accel[:, 0], 0)
-        self.accel_y = np.flip(accel[:, 1], 0)
-        self.accel_z = np.flip(accel[:, 2], 0)
-        self.vel_x = np.flip(vel[:, 0], 0)
-        self.vel_y = np.flip(vel[:, 1], 0)
-        self.vel_z = np.flip(vel[:, 2], 0)
-        self.orient_x = np.flip(orient[:, 0], 0)
-        self.orient_y = np.flip(orient[:, 1], 0)
-        self.orient_z = np.flip(orient[:, 2], 0)
-        self.orient_w = np.flip(orient[:, 3], 0)
-        self.t_elapsed = np.flip(accel_elapsed[:], 0)
-        self.vel_max = max([max(vel[:, i]) for i in range(3)])
-        self.vel_min = min([min(vel[:, i]) for i in range(3)])
-        self.accel_max = max([max(accel[:, i]) for i in range(3)])
-        self.accel_min = min([min(accel[:, i]) for i in range(3)])
+        accel, vel, orient = accel[:], vel[:], orient[:]
+        # store each sensor as a single (nsamples, ndim) array in chronological order;
+        # per-axis accessors below return column views of these.
+        self.accel = accel[::-1]
+        self.vel = vel[::-1]
+        self.orient = orient[::-1]
+        self.t_elapsed = accel_elapsed[:][::-1]
+        self.vel_max = vel.max()
+        self.vel_min = vel.min()
+        self.accel_max = accel.max()
+        self.accel_min = accel.min()
+
+    @property
+    def accel_x(self):
+        return self.accel[:, 0]
+
+    @property
+    def accel_y(self):
+        return self.accel[:, 1]
+
+    @property
+    def accel_z(self):
+        return self.accel[:, 2]
+
+    @property
+    def vel_x(self):
+        return self.vel[:, 0]
+
+    @property
+    def vel_y(self):
+        return self.vel[:, 1]
+
+    @property
+    def vel_z(self):
+        return self.vel[:, 2]
+
+    @property
+    def orient_x(self):
+        return self.orient[:, 0]
+
+    @property
+    def orient_y(self):
+        return self.orient[:, 1]
+
+    @property
+    def orient_z(self):
+        return self.orient[:, 2]
+
+    @property
+    def orient_w(self):
+        return self.orient[:, 3]
 
 
 class GloveletImuPlotEventDispatcher(EventDispatcher):
@@ -166,13 +238,13 @@ class GloveletImuPlotEventDispatcher(EventDispatcher):
                                                      rot_series_sz=self.__rot_series_sz)
         self.__stream.register_monitor(imu_monitor)
         self.__stream.open()
-        while not self.__stream.is_open():
-            continue
+        if not self.__stream.wait_open(timeout=5.0):
+            raise TimeoutError('SensorStream connection timeout.')
         return (imu_monitor,), {}
 
     def update(self, imu_monitor):
         if self.__stream.is_open():
-            self.__stream.update()
+            self.__stream.drain(MAX_SAMPLE_BATCH)
             imu_event = GloveletImuEventFlipped(imu_monitor.acceleration_timeseries,
                                          imu_monitor.velocity_timeseries,
                                          imu_monitor.orientation_timeseries,
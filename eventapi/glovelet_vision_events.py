@@ -41,14 +41,17 @@ class GloveletVisionEventDispatcher(EventDispatcher):
         vision.check_exit()
         return vision_event
 
-    def finish(self, *args, **kwargs):
-        pass
+    def finish(self, vision):
+        vision.release()
 
 class GloveletVisionListener(EventListener):
+    DEBUG = False  # Print every cursor position. Console output every frame slows down the event loop.
+
     def __init__(self):
         callbacks = {GloveletVisionEvent: self.on_vision_event}
         super().__init__(callbacks)
 
     def on_vision_event(self, event):
-        print('{} {}'.format(event.x, event.y))
+        if self.DEBUG:
+            print('{} {}'.format(event.x, event.y))
         pyautogui.moveTo(event.x, event.y)
@@ -29,13 +29,13 @@ class FingerFlexGroup(Sensor):
 
 
 def accel_post_filter(time_series):
-    data = time_series[0]
+    data = time_series.at(0)
     data[1], data[2] = -data[2], -data[1]
     return data
 
 
 def rot_axis_correction(time_series):
-    data = time_series[0]
+    data = time_series.at(0)
     data[1], data[2] = data[2], data[1]
     return data
 
@@ -105,9 +105,9 @@ class GloveletBNO055IMUSensorMonitor(SensorDataMonitor):
     def orientation_timeseries(self):
         return self.__rot_timeseries
 
-    def update(self, data):
+    def update(self, data, timestamp=None):
         b, a = self.__bttr_numtr_low, self.__bttr_denom_low
-        self.__acc_timeseries.add(data[:3])
+        self.__acc_timeseries.add(data[:3], timestamp)
         # self.__acc_timeseries.add(delta_scale(data[:3], k_max=4, k_min=0.17, n=0))
         self.__rot_timeseries.add((data[3:]), self.__acc_timeseries.timestamp[0])
         # if self.__acc_lowpassed.added > 15:
@@ -180,8 +180,8 @@ class GloveletFlexSensorMonitor(SensorDataMonitor):
     def time_elapsed(self):
         return self.__timeseries.time_elapsed
 
-    def update(self, data):
-        self.__timeseries.add(data)
+    def update(self, data, timestamp=None):
+        self.__timeseries.add(data, timestamp)
 
     def get_flex_data(self):
         return self.__timeseries[0]
@@ -5,6 +5,7 @@ import serial
 from enum import Enum
 import numpy as np
 from multiprocessing import Lock
+from threading import Event
 import time
 import logging
 import sys
@@ -54,11 +55,12 @@ class SensorDataMonitor:
             raise TypeError('Expected `SensorStreamDataChannel` object for `channel` argument.')
         self.__sensor = sensor
 
-    def update(self, data):
+    def update(self, data, timestamp=None):
         """
         *Abstract interface method. Implement subroutine for handling data.*\n
         This is the method `SensorStream` will invoke when updating its\t
-        registered `SensorDataMonitor` objects.
+        registered `SensorDataMonitor` objects. `timestamp` is the time in\t
+        seconds at which `data` was read, shared by all monitors of the stream.
         """
         raise NotImplementedError
 
@@ -98,6 +100,7 @@ class SensorStream:
         self.__success_str = conn_success_str
         self.__timeout = conn_timeout
         self.__conn_status = SensorStreamConnectionStatus.CLOSED
+        self.__opened = Event()
         self.__registered_monitors = set()
         self.__registered_sensors = dict()
         self.__read_offset = None
@@ -117,14 +120,39 @@ class SensorStream:
         """
         return self.__conn_status
 
-    def update(self):
-        """Issues an update to all of the registered sensors."""
+    def update(self, timestamp=None):
+        """
+        Issues an update to all of the registered sensors.\n
+        :param `timestamp`: *optional* `float` time in seconds to pass to the monitors. If `None`,
+        the monotonic clock is read once after reading the data and shared by all monitors.
+        """
         data = self.read_data()
         if data is None:
             return
+        if timestamp is None:
+            timestamp = time.monotonic()
         for monitor in self.__registered_monitors:
             start, stop = monitor.sensor.channel.get_start(), monitor.sensor.channel.get_stop()
-            monitor.update(data[start:stop])
+            monitor.update(data[start:stop], timestamp)
+
+    def drain(self, max_samples):
+        """
+        Issues updates until no more data is waiting to be read, or `max_samples` updates have been issued.\n
+        Blocks on the first update in the same way as `update`.\t
+        :param `max_samples`: `int` the maximum number of updates to issue\t
+        :returns: `int` the number of updates issued.
+        """
+        n = 0
+        while n < max_samples:
+            self.update()
+            n += 1
+            if not self.has_data():
+                break
+        return n
+
+    def has_data(self):
+        """`True` if data is waiting to be read from the serial port."""
+        return self.is_open() and self.__serial.in_waiting > 0
 
     def read_data(self):
         """Read from stream."""
@@ -201,6 +229,14 @@ class SensorStream:
     def is_open(self):
         return self.get_connection_status() is SensorStreamConnectionStatus.OPEN
 
+    def wait_open(self, timeout=None):
+        """
+        Block until the connection is open.\n
+        :param `timeout`: `float` seconds to wait before giving up, or `None` to wait indefinitely\t
+        :returns: `True` if the connection is open, `False` if the wait timed out.
+        """
+        return self.__opened.wait(timeout)
+
     def pause(self):
         # TODO: Implement a pause feature for the data stream
         raise NotImplementedError
@@ -226,6 +262,10 @@ class SensorStream:
     def __set_conn_status(self, status):
         self.__logger.debug(status.name)
         self.__conn_status = status
+        if status is SensorStreamConnectionStatus.OPEN:
+            self.__opened.set()
+        else:
+            self.__opened.clear()
 
     def __readline(self):
         success = False
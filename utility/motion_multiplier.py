@@ -8,15 +8,13 @@
 #               too much calibration to find a happy medium.
 __all__ = ["motion_multiplier", "u", "delta_scale"]
 
-from collections import Iterable
+import numpy as np
 
 
 def u(dr, k_max=20, k_min=4, n=2, m=1):
-    if dr < k_min:
-        return -m
-    elif dr > k_max:
-        return n
-    return ((n + m) * (dr - k_min) / (k_max - k_min)) - m
+    # clamping the linear ramp to [0, n + m] covers the dr < k_min and dr > k_max cases without branching,
+    # and accepts either a scalar or an array of deltas.
+    return np.clip(((n + m) * (dr - k_min)) / (k_max - k_min), 0.0, n + m) - m
 
 
 def motion_multiplier(prev_coord, delta_real_coord, k_max=20, k_min=4, n=2, m=1):
@@ -32,9 +30,4 @@ def motion_multiplier(prev_coord, delta_real_coord, k_max=20, k_min=4, n=2, m=1)
     return prev_coord + delta_scale(delta_real_coord, k_max, k_min, n, m)
 
 def delta_scale(delta, k_max=20, k_min=4, n=2, m=1):
-    res = None
-    if isinstance(delta, Iterable):
-        res = delta * [(1 + u(abs(dr), k_max, k_min, n, m)) for dr in delta]
-    else:
-        res = delta * (1 + u(abs(delta), k_max, k_min, n, m))
-    return res
+    return delta * (1 + u(np.abs(delta), k_max, k_min, n, m))
@@ -8,7 +8,39 @@ __all__ = ["DataTimeSeries", "DataSequence"]
 import time
 import numpy as np
 from collections import Iterable
-from scipy.signal import butter, filtfilt
+from scipy.signal import butter, filtfilt, sosfilt_zi
+try:
+    from numba import njit
+except ImportError:  # numba is optional, the NumPy slicing implementation is used without it
+    njit = None
+
+
+def _extract_range(data_series, head, nsamples, start, out):
+    """Copy samples into `out` in sequential order, starting `start` samples back from `head`."""
+    for i in range(out.shape[0]):
+        out[i] = data_series[(head - start - i) % nsamples]
+    return out
+
+
+def _ewma(data_series, head, nsamples, n, weight, out):
+    """Exponentially weighted average of the `n` most recent samples of a 2-dimensional ring buffer, into `out`."""
+    denom = (1.0 - weight**n) / (1.0 - weight) if weight != 1.0 else float(n)
+    for d in range(out.shape[0]):
+        acc = 0.0
+        w = 1.0
+        for i in range(n):
+            acc += w * data_series[(head - i) % nsamples, d]
+            w *= weight
+        out[d] = acc / denom
+    return out
+
+
+_extract_range_nb = njit(cache=True)(_extract_range) if njit is not None else None
+_ewma_nb = njit(cache=True, fastmath=True)(_ewma) if njit is not None else None
+
+# tdelta is a sub-second interval, so single precision suffices. Time elapsed grows without bound and timestamps are
+# absolute clock readings, so both keep double precision.
+_TIMEINFO_DTYPE = np.dtype([('tdelta', np.float32), ('time_elapsed', np.float64), ('timestamp', np.float64)])
 
 
 class DataSequence:
@@ -28,9 +60,16 @@ class DataSequence:
             self.__shape = (samples, dimensions)
         self.__added = 0
         self.__head = 0
+        # when `samples` is a power of two, wrapping an index reduces to a bitwise AND with this mask.
+        self.__mask = samples - 1
+        self.__pow2 = samples & self.__mask == 0
         # initialize data series
-        self.data_series = np.zeros(self.__shape, dtype)
-        self.__dtype = self.data_series.dtype
+        self._series = np.zeros(self.__shape, dtype)
+        self.__dtype = self._series.dtype
+
+    @property
+    def data_series(self):
+        return self._series
 
     @property
     def nsamples(self):
@@ -70,7 +109,30 @@ class DataSequence:
         """
         self._increment_added()
         self._increment_head()
-        self.data_series[self.head] = data
+        self._series[self.head] = data
+
+    def at(self, i):
+        """
+        Access the sample `i` samples before the most recent sample.\n
+        Equivalent to `self[i]` for an integer `i`, without the key-type dispatch of the array access operator.
+        """
+        return self.data_series[self._get_real_index(i)]
+
+    def set_at(self, i, value):
+        """
+        Overwrite the sample `i` samples before the most recent sample.\n
+        Equivalent to `self[i] = value` for an integer `i`.
+        """
+        self.data_series[self._get_real_index(i)] = value
+
+    def slice_range(self, start=0, stop=None):
+        """
+        Extract samples `start` up to `stop` in sequential order, most recent first.\n
+        Equivalent to `self[start:stop]`.
+        """
+        if stop is None:
+            stop = self.nsamples
+        return self.__extract_range(start, stop)
 
     def _increment_head(self):
         self.__head += 1
@@ -82,6 +144,8 @@ class DataSequence:
             self.__added += 1
 
     def _get_real_index(self, from_head):
+        if self.__pow2:
+            return (self.__head - from_head) & self.__mask
         result = self.head - from_head
         if result < 0:
             result += self.nsamples
@@ -93,7 +157,10 @@ class DataSequence:
             shape = self.shape
         else:
             shape = (stop - start,) + self.shape[1:]
-        result = np.zeros(shape, self.dtype)
+        # every element is written below, so skip zero-initialization
+        result = np.empty(shape, self.dtype)
+        if _extract_range_nb is not None:
+            return _extract_range_nb(self.data_series, self.head, self.nsamples, start, result)
         start_ind = self._get_real_index(start)
         end_ind = self._get_real_index(stop)
         if end_ind >= start_ind:
@@ -143,8 +210,10 @@ class DataSequence:
     def __getitem__(self, key):
         if isinstance(key, tuple) and len(key) <= 2:
             res = self[key[0]]
-            res =  res[key]
-            return res
+            # the row key has already been applied; index the remaining dimension only.
+            if isinstance(key[0], slice):
+                return res[(slice(None),) + key[1:]]
+            return res[key[1:]]
         elif isinstance(key, slice):
             start, stop, step = key.start, key.stop, key.step
             if step is None or step != 1:  # TODO: Implement support for 'step' slice argument
@@ -166,6 +235,35 @@ class DataSequence:
         return output
 
 
+class _DataSequenceField:
+    """
+    Read-only view of a single field of a `DataSequence` with a structured dtype.\n
+    Indexed in the same way as a 1-dimensional `DataSequence`.
+    """
+
+    def __init__(self, sequence, field):
+        self.__sequence = sequence
+        self.__field = field
+
+    @property
+    def nsamples(self):
+        return self.__sequence.nsamples
+
+    @property
+    def head(self):
+        return self.__sequence.head
+
+    @property
+    def added(self):
+        return self.__sequence.added
+
+    def __getitem__(self, key):
+        return self.__sequence[key][self.__field]
+
+    def __str__(self):
+        return '\n'.join(str(self[i]) for i in range(self.nsamples))
+
+
 class DataTimeSeries(DataSequence):
     """
     A class structure that simplifies recording data over time.\n
@@ -186,8 +284,9 @@ class DataTimeSeries(DataSequence):
     these will be invoked prior to and post respectively on application of the filter specified by the `filter_alg`
     argument.\n
     `filter_alg`: The name of the built-in algorithm to use for filtering the data. Accepted values are `'ewma'`
-    (Exponential Weighted Moving Average), `'sma'` (Simple Moving Average), and `None`. If `None`, no built-in filter
-    will be used. Any functions bound to `pre_filter` or `post_filter` will be invoked if `auto_filter` is `True`.\n
+    (Exponential Weighted Moving Average), `'sma'` (Simple Moving Average), `'lowpass'` (streaming Butterworth lowpass)
+    and `None`. If `None`, no built-in filter will be used. Any functions bound to `pre_filter` or `post_filter` will be
+    invoked if `auto_filter` is `True`.\n
     `pre_filter`: Binds function that accepts as its first argument a `DataTimeSeries` object, and returns
     a single altered data sample. This function is invoked before the built-in filter. Note that if no data sample
     is returned by the bound function, no effect will result. If something other than a data sample is returned,
@@ -199,6 +298,9 @@ class DataTimeSeries(DataSequence):
     `ewma_weight`: The weight used in when calculating the EWMA of the series. If left as the default value,
     a weight will be automatically computed which is based on the number of samples currently added to the series. If
     `auto_filter` is `False` or if `filter_alg` is not `'ewma'`, this value will be ignored.\n
+    `lowpass_order`: The order of the Butterworth filter used when `filter_alg` is `'lowpass'`.\n
+    `lowpass_critical`: The normalized critical frequency of the Butterworth filter used when `filter_alg`
+    is `'lowpass'`.\n
     Usage Examples\t
     ___\t
     \tmy_timeseries.add(data)\t
@@ -213,7 +315,8 @@ class DataTimeSeries(DataSequence):
 
     def __init__(self, nsamples, ndim, dtype='f',
                  auto_filter=False, filter_alg='ewma',
-                 pre_filter=None, post_filter=None, ewma_weight=None):
+                 pre_filter=None, post_filter=None, ewma_weight=None,
+                 lowpass_order=2, lowpass_critical=0.15):
         """
         Constructs a `DataTimeSeries` object.\n
         **** Parameters ****\t
@@ -228,8 +331,9 @@ class DataTimeSeries(DataSequence):
         these will be invoked prior to and post respectively on application of the filter specified by the `filter_alg`
         argument.\t
         :param filter_alg: The name of the built-in algorithm to use for filtering the data. Accepted values are `'ewma'`
-        (Exponential Weighted Moving Average), `'sma'` (Simple Moving Average), and `None`. If `None`, no built-in filter
-        will be used. Any functions bound to `pre_filter` or `post_filter` will be invoked if `auto_filter` is `True`.\t
+        (Exponential Weighted Moving Average), `'sma'` (Simple Moving Average), `'lowpass'` (streaming Butterworth
+        lowpass) and `None`. If `None`, no built-in filter will be used. Any functions bound to `pre_filter` or
+        `post_filter` will be invoked if `auto_filter` is `True`.\t
         :param pre_filter: Binds function that accepts as its first argument a `DataTimeSeries` object, and returns
         a single altered data sample. This function is invoked before the built-in filter. Note that if no data sample
         is returned by the bound function, no effect will result. If something other than a data sample is returned,
@@ -240,31 +344,40 @@ class DataTimeSeries(DataSequence):
         an error will be raised.\t
         :param ewma_weight: The weight used in when calculating the EWMA of the series. If left as the default value,
         a weight will be automatically computed which is based on the number of samples currently added to the series. If
-        `auto_filter` is `False` or if `filter_alg` is not `'ewma'`, this value will be ignored.
+        `auto_filter` is `False` or if `filter_alg` is not `'ewma'`, this value will be ignored.\t
+        :param lowpass_order: The order of the Butterworth filter used when `filter_alg` is `'lowpass'`.\t
+        :param lowpass_critical: The normalized critical frequency of the Butterworth filter used when `filter_alg`
+        is `'lowpass'`.
         """
         super().__init__(nsamples, ndim, dtype)
         self.__exp_weights = np.zeros((nsamples), 'f')
         self.__weight = ewma_weight
         self.__denom = 0.0
-        self.tdelta = DataSequence(nsamples, 1)
-        self.time_elapsed = DataSequence(nsamples, 1, dtype=float)
-        self.timestamp = DataSequence(nsamples, 1, dtype=float)
-        # bind initial function for adding data to the series
-        self.add = self.__initial_time_add
-        self.__raw_data = np.zeros(self.shape, self.dtype)
-        # initialize data series
-        self.data_series = self.__raw_data   # use raw data if not auto-filtered.
+        self.__weights_n = 0
+        self.__ewma_scratch = np.zeros(self.shape[1:], self.dtype)
+        self.__ewma_partial = np.zeros(self.shape[1:], self.dtype)
+        # tdelta, time elapsed and timestamp are always recorded together, so share one sequence between them.
+        self._timeinfo = DataSequence(nsamples, 1, dtype=_TIMEINFO_DTYPE)
+        self.__tdelta = _DataSequenceField(self._timeinfo, 'tdelta')
+        self.__time_elapsed = _DataSequenceField(self._timeinfo, 'time_elapsed')
+        self.__timestamp = _DataSequenceField(self._timeinfo, 'timestamp')
+        # raw samples are stored in the `DataSequence` buffer; `data_series` exposes the filtered buffer instead
+        # if auto-filtered, except while the filter is being computed.
         self.__filtered_data = None
+        self.__filtering = False
         if auto_filter:
             self.__filtered_data = np.zeros(self.shape, self.dtype)
-            self.data_series = self.__filtered_data  # use filtered data if auto-filtered.
             # bind auto-filter function
             if filter_alg == 'ewma':
                 self.__filter = self.ewma
             elif filter_alg == 'sma':
                 self.__filter['sma'] = self.sma
             elif filter_alg == 'lowpass':
-                self.__filter = self.__pass_filter # TODO: Finish implementing lowpass filter
+                # filter one sample per `add` with cascaded biquads, carrying their state between samples.
+                self.__sos = butter(lowpass_order, lowpass_critical, btype='lowpass', output='sos')
+                self.__sos_state = np.zeros((len(self.__sos), 2) + self.shape[1:])
+                self.__sos_seeded = False
+                self.__filter = self.__lowpass_filter
             elif filter_alg is None:
                 self.__filter = self.__pass_filter
             # bind pre-filter and post-filter callback
@@ -276,104 +389,127 @@ class DataTimeSeries(DataSequence):
         Add a data sample to the time series.\n
         If the time series is filled, the oldest value in the time series is overwritten.\t
         :param data:      The data to insert into the series. Can be any iterable of length `ndim` dimensions.\t
-        :param timestamp: *optional* specify the timestamp of this data sample\t
+        :param timestamp: *optional* specify the timestamp of this data sample in seconds. Defaults to the monotonic clock.\t
+        :param tdelta: *optional* specify the time since the previous sample. Computed from the timestamps by default.\t
+        :param time_elapsed: *optional* specify the time elapsed since the first sample. Accumulated from `tdelta` by default.\t
         :param pre_args: tuple of arguments to pass to `pre_filter` callable\t
         :param post_args: tuple of arguments to pass to `post_filter` callable\t
         """
-        # NOTE: `add` is rebound at DataTimeSeries object creation
-        pass
+        is_first = self._timeinfo.added == 0
+        super().add(data)
+        # calculate tdelta & add timestamp and tdelta
+        if timestamp is None:
+            timestamp = time.monotonic()
+        if is_first:
+            if tdelta is None:
+                tdelta = 0.0
+            if time_elapsed is None:
+                time_elapsed = 0.0
+        else:
+            _, prev_time_elapsed, prev_timestamp = self._timeinfo[0].item()
+            if tdelta is None:
+                tdelta = timestamp - prev_timestamp
+            if time_elapsed is None:
+                time_elapsed = prev_time_elapsed + tdelta
+        self._timeinfo.add((tdelta, time_elapsed, timestamp))
+        # pre-compute weights for EWMA algorithm until the series is filled
+        if self.__weights_n < self.nsamples:
+            self.__compute_exponential_weights()
+        # if auto_filter was set to True at DataTimeSeries creation, the below will execute
+        if self.__filtered_data is not None:
+            self.__filter_data(pre_args, post_args)
+
+    @property
+    def tdelta(self):
+        return self.__tdelta
+
+    @property
+    def time_elapsed(self):
+        return self.__time_elapsed
+
+    @property
+    def timestamp(self):
+        return self.__timestamp
+
+    @property
+    def data_series(self):
+        if self.__filtered_data is None or self.__filtering:
+            return self._series
+        return self.__filtered_data
 
     def ewma(self):
         """
         Calculate the Exponential Weighted Moving Average over the data series.\n
         Uninitialized values will not factor into the average.
+        The returned array is reused by subsequent calls, copy it if the result must be retained.
         """
-        result = np.zeros((self.ndim), self.dtype)
-        for i in range(self.added):
-            result += (self.__exp_weights[i] * self[i])
-        return result / self.__denom
+        head, n, ds = self.head, self.added, self.data_series
+        result = self.__ewma_scratch
+        self.__compute_exponential_weights()
+        if _ewma_nb is not None and n > 0 and ds.ndim == 2:
+            return _ewma_nb(ds, head, self.nsamples, n, self.__weight, result)
+        weights = self.__exp_weights
+        # weights are ordered newest to oldest, so walk the ring buffer backwards from `head`
+        # as two reversed views (no copy) rather than reconstructing each index.
+        k = min(head + 1, n)
+        np.matmul(weights[:k], ds[head::-1][:k], out=result)
+        if n > k:
+            result += np.matmul(weights[k:n], ds[:head:-1][:n - k], out=self.__ewma_partial)
+        return np.true_divide(result, self.__denom, out=result)
 
     def sma(self):
         """
         Calculate the Simple Moving Average over the data series.\n
         Uninitialized values will not factor into the average.
         """
-        if self.added == 0:
+        n = self.added
+        if n == 0:
             return 0
-        result = np.zeros(self.ndim, self.dtype)
-        result = sum(self[:]) / self.added
-        return result
+        # sample order does not affect the mean, so reduce over the buffer in place.
+        # Until the series wraps, samples occupy indices 1 through `added`.
+        if n < self.nsamples:
+            return self.data_series[1:n + 1].mean(axis=0)
+        return self.data_series.mean(axis=0)
 
     def __pass_filter(self):
-        return self[0]
+        return self.at(0)
+
+    def __lowpass_filter(self):
+        x = self._series[self.head]
+        state = self.__sos_state
+        if not self.__sos_seeded:
+            # start from the steady state of the first sample to avoid a transient from zero.
+            state[:] = sosfilt_zi(self.__sos).reshape(state.shape[:2] + (1,) * (state.ndim - 2)) * x
+            self.__sos_seeded = True
+        # transposed direct form II, one biquad section at a time.
+        for (b0, b1, b2, _, a1, a2), z in zip(self.__sos, state):
+            y = b0 * x + z[0]
+            z[0] = b1 * x - a1 * y + z[1]
+            z[1] = b2 * x - a2 * y
+            x = y
+        return x
 
     def __compute_exponential_weights(self):
+        n = self.added
+        if n == self.__weights_n:
+            return
         if self.__weight is None:
-            self.__weight = 1 - (2.0 / (self.added + 1))
-        self.__denom = 0.0
-        for i in range(self.added):
-            self.__exp_weights[i] = self.__weight**(i)
-            self.__denom += self.__exp_weights[i]
-
-    def __initial_time_add(self, data, timestamp=None, tdelta=None, time_elapsed=None, pre_args=(), post_args=()):
-        # bind next function for adding data to series until series is fully initialized
-        self.add = self.__initialize_series_add
-        self.data_series = self.__raw_data
-        super().add(data)
-        # calculate tdelta & add timestamp and tdelta
-        if timestamp is None:
-            timestamp = time.time()
-        if time_elapsed is None:
-            self.time_elapsed.add(0.0)
-        else:
-            self.time_elapsed.add(time_elapsed)
-        if tdelta is None:
-            self.tdelta.add(0.0)
-        else:
-            self.tdelta.add(tdelta)
-        self.timestamp.add(timestamp)
-        # pre-compute weights for EWMA algorithm
-        self.__compute_exponential_weights()
-        # if auto_filter was set to True at DataTimeSeries creation, the below will execute
-        if self.__filtered_data is not None:
-            self.__filter_data(pre_args, post_args)
-
-    def __initialize_series_add(self, *args, **kwargs):
-        """
-        Repeats everytime 'add' is called until the data series has been completely initialized/filled with data,
-        at which point `add` is bound to `__add` to optimize performance.
-        """
-        if self.added >= self.nsamples:
-            # Rebind add method once series has been initialized/filled with data
-            self.add = self.__add
-        self.__compute_exponential_weights()
-        self.__add(*args, **kwargs)
-
-    def __add(self, data, timestamp=None, tdelta=None, time_elapsed=None, pre_args=(), post_args=()):
-        """The optimized version of the `add` function."""
-        self.data_series = self.__raw_data
-        super().add(data)
-        # calculate tdelta & add timestamp and tdelta
-        if timestamp is None:
-            timestamp = time.time()
-        if tdelta is None:
-            tdelta = timestamp - self.timestamp[0]
-        if time_elapsed is None:
-            time_elapsed = self.time_elapsed[0] + tdelta
-        self.time_elapsed.add(time_elapsed)
-        self.tdelta.add(tdelta)
-        self.timestamp.add(timestamp)
-        # if auto_filter was set to True at DataTimeSeries creation, the below will execute
-        if self.__filtered_data is not None:
-            self.__filter_data(pre_args, post_args)
+            self.__weight = 1 - (2.0 / (n + 1))
+        w = self.__weight
+        np.power(w, np.arange(n), out=self.__exp_weights[:n])
+        # closed form of the geometric series w**0 + w**1 + ... + w**(n-1)
+        self.__denom = (1.0 - w**n) / (1.0 - w) if w != 1.0 else float(n)
+        self.__weights_n = n
 
     def __filter_data(self, pre_args=(), post_args=()):
-        self.data_series = self.__raw_data
-        if callable(self.pre_filter):
-            # pre-filter callable must take DataTimeSeries and return single data record.
-            self.__filtered_data[self.head] = self.pre_filter(self, *pre_args)
-        self.__filtered_data[self.head] = self.__filter()
-        self.data_series = self.__filtered_data
+        self.__filtering = True
+        try:
+            if callable(self.pre_filter):
+                # pre-filter callable must take DataTimeSeries and return single data record.
+                self.__filtered_data[self.head] = self.pre_filter(self, *pre_args)
+            self.__filtered_data[self.head] = self.__filter()
+        finally:
+            self.__filtering = False
         if callable(self.post_filter):
             # post-filter callable must take DataTimeSeries and return single data record.
             self.__filtered_data[self.head] = self.post_filter(self, *post_args)
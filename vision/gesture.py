@@ -1,3 +1,4 @@
+import math
 import numpy as np
 import sys
 
@@ -30,18 +31,16 @@ class Gesture:
         return (self.GESTURE_MAX_DIM / max(yMax-yMin, xMax-xMin))
     
     def curve_length(self):
-        cummulative_distance = 0
+        # length of every segment at once, then the running total along the curve.
+        segments = np.diff(self.points, axis=0)
         indices = np.empty(len(self.points))
         indices[0] = 0
-        for i in range(1, len(self.points)):
-            cummulative_distance += Gesture.calculate_distance(self.points[i], self.points[i-1]) 
-            indices[i] = cummulative_distance
-        return cummulative_distance, indices
+        np.cumsum(np.hypot(segments[:, 0], segments[:, 1]), out=indices[1:])
+        return indices[-1], indices
     
     @staticmethod
     def calculate_distance(point1, point2):
-        return ((point1[0] - point2[0])**2 +
-                (point1[1] - point2[1])**2)**0.5
+        return math.hypot(point1[0] - point2[0], point1[1] - point2[1])
 
     @staticmethod
     def find_indices(template, template_distance):
@@ -91,7 +90,7 @@ class Gesture:
             distance = Gesture.calculate_distance(compare_point, human_gesture.points[i])
             total_distance += distance
             distances += [distance]
-            total_error += distance**2
+            total_error += distance * distance
         min_distance = min(distances)
         max_distance = max(distances)
         distance_range = max_distance - min_distance
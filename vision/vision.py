@@ -2,7 +2,7 @@ import numpy as np
 import tkinter
 import pyautogui
 import math
-from glovelet.utility.timeseries import DataTimeSeries
+from glovelet.utility.timeseries import DataTimeSeries, DataSequence
 from glovelet.utility.motion_multiplier import motion_multiplier
 import logging
 from ast import literal_eval
@@ -10,6 +10,7 @@ import sys
 import cv2
 from glovelet.vision.gesture import Gesture
 from glovelet.vision.gestureAPI import PreDefinedGestures
+from glovelet.vision.webcamstream import WebcamStream
 from glovelet.eventapi.event import EventAPIException
 
 def callback(value):
@@ -19,19 +20,30 @@ def callback(value):
 class Vision:
     WINDOW_SIZE = 4  # The window size for calculating hte average
     PREV_MEMORY = 2  # Previous points stored.
+    MOVEMENT_MEMORY = 32  # Number of past hand positions kept for the stationary check and drawing.
+    CAPTURE_WIDTH = 640  # Capture resolution. Color tracking does not need more, and every
+    CAPTURE_HEIGHT = 480  # per-frame operation scales with the number of pixels.
 
     def __init__(self, default_values):
         pyautogui.FAILSAFE = False
         root = tkinter.Tk()
         root.withdraw()
         # member variables
-        self.webcam = cv2.VideoCapture(0)
+        self.webcam = WebcamStream(0)
         self.screen_width = root.winfo_screenwidth()
         self.screen_height = root.winfo_screenheight()
-        self.cameraWidth = self.screen_width / 2
-        self.cameraHeight = self.screen_height / 2
+        self.cameraWidth = self.CAPTURE_WIDTH
+        self.cameraHeight = self.CAPTURE_HEIGHT
+        # MJPEG lets USB webcams deliver full frame rate where raw YUYV is bandwidth limited.
+        self.webcam.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
         self.webcam.set(cv2.CAP_PROP_FRAME_WIDTH, self.cameraWidth)
         self.webcam.set(cv2.CAP_PROP_FRAME_HEIGHT, self.cameraHeight)
+        self.webcam.start()
+        # the device may not support the requested resolution, so scale the cursor by what it actually captures.
+        self.cameraWidth = int(self.webcam.get(cv2.CAP_PROP_FRAME_WIDTH)) or self.cameraWidth
+        self.cameraHeight = int(self.webcam.get(cv2.CAP_PROP_FRAME_HEIGHT)) or self.cameraHeight
+        self.cursorScaleX = self.screen_width / self.cameraWidth
+        self.cursorScaleY = self.screen_height / self.cameraHeight
         self.output = {}
         self.handContour = {}
         self.canvas = None
@@ -44,6 +56,8 @@ class Vision:
         self.mouseY = self.screen_height/2
         self.queue = []
         self.clickThresh = 45
+        # squared radius around its average position within which the hand is considered stationary
+        self.stationaryThreshSq = (0.04 * min(self.cameraWidth, self.cameraHeight))**2
         self.pinched = False
         self.window = {}
         self.movement_history = {}
@@ -52,13 +66,20 @@ class Vision:
         self.can_do_gesture = False
         self.boundaries = {}
         self.init_mem_vars(default_values)
+        # HSV bounds and morphology kernel are constant, so build the arrays once instead of every frame.
+        lower, upper = self.boundaries
+        self.lower_bound = np.asarray(lower, np.uint8)
+        self.upper_bound = np.asarray(upper, np.uint8)
+        self.kernel = np.ones((5, 5), np.uint8)
+        self.init_cuda()
         self.handMoment = (0, 0)
         self.foundContour = True
         self.stationary = False
         self.record = False
         self.realX = 0
         self.realY = 0
-        self.movement_history = []
+        # fixed size ring buffer of past positions, most recent at index 0, rather than an ever growing list.
+        self.movement_history = DataSequence(self.MOVEMENT_MEMORY, 2)
         self.window = DataTimeSeries(
                 self.WINDOW_SIZE, 2, auto_filter=True)
         self.init_gestures()
@@ -82,6 +103,25 @@ class Vision:
                 print('Not all the fingers have colors configured. Run with -r flag')
                 sys.exit()
 
+    def init_cuda(self):
+        # Run the per-pixel thresholding steps on the GPU when OpenCV was built with CUDA and a device is present.
+        self.use_cuda = hasattr(cv2, 'cuda') and hasattr(cv2.cuda, 'inRange') \
+            and cv2.cuda.getCudaEnabledDeviceCount() > 0
+        if not self.use_cuda:
+            return
+        # device buffers are allocated on the first frame and reused as the `dst` of every later call.
+        self.gpuFrame = cv2.cuda_GpuMat()
+        self.gpuFlipped = cv2.cuda_GpuMat()
+        self.gpuHsv = cv2.cuda_GpuMat()
+        self.gpuMask = cv2.cuda_GpuMat()
+        self.gpuEroded = cv2.cuda_GpuMat()
+        self.gpuDilated = cv2.cuda_GpuMat()
+        self.gpuBounds = (tuple(int(v) for v in self.lower_bound), tuple(int(v) for v in self.upper_bound))
+        self.gpuErode = cv2.cuda.createMorphologyFilter(
+            cv2.MORPH_ERODE, cv2.CV_8UC1, self.kernel, iterations=1)
+        self.gpuDilate = cv2.cuda.createMorphologyFilter(
+            cv2.MORPH_DILATE, cv2.CV_8UC1, self.kernel, iterations=3)
+
     def init_gestures(self):
         self.defined_gestures = PreDefinedGestures()
         self.gestures = self.defined_gestures.predefined_gestures
@@ -117,68 +157,71 @@ class Vision:
 
     def read_webcam(self):
         _, self.frame = self.webcam.read()
-        self.frame = cv2.flip(self.frame, 1)
+        if self.use_cuda:
+            self.gpuFrame.upload(self.frame)
+            cv2.cuda.flip(self.gpuFrame, 1, dst=self.gpuFlipped)
+            cv2.cuda.cvtColor(self.gpuFlipped, cv2.COLOR_BGR2HSV, dst=self.gpuHsv)
+            # `threshold` works from the copy on the GPU; this keeps `self.frame` the flipped HSV frame on both paths.
+            self.frame = self.gpuHsv.download()
+        else:
+            self.frame = cv2.flip(self.frame, 1)
         # for finger in self.ACTIVE_FINGERS:
-        self.canvas = np.zeros(self.frame.shape, np.uint8)
-        self.frame = cv2.cvtColor(self.frame, cv2.COLOR_BGR2HSV)
+        # reuse the canvas between frames, only allocating it on the first frame or if the resolution changes.
+        if self.canvas is None or self.canvas.shape != self.frame.shape:
+            self.canvas = np.zeros(self.frame.shape, np.uint8)
+        else:
+            self.canvas.fill(0)
+        if not self.use_cuda:
+            self.frame = cv2.cvtColor(self.frame, cv2.COLOR_BGR2HSV)
 
     def threshold(self):
-        (lower, upper) = self.boundaries
-        lower = np.array(lower, dtype="uint8")
-        upper = np.array(upper, dtype="uint8")
-        mask = cv2.inRange(self.frame, lower, upper)
-        kernel = np.ones((5, 5), np.uint8)
-        self.output = cv2.bitwise_and(
-            self.frame, self.frame, mask=mask)
-        self.output = cv2.cvtColor(
-            self.output, cv2.COLOR_BGR2GRAY)
+        if self.use_cuda:
+            # the filtered mask is downloaded for contour extraction on the CPU.
+            cv2.cuda.inRange(self.gpuHsv, *self.gpuBounds, dst=self.gpuMask)
+            self.gpuErode.apply(self.gpuMask, dst=self.gpuEroded)
+            self.gpuDilate.apply(self.gpuEroded, dst=self.gpuDilated)
+            self.output = self.gpuDilated.download()
+            return
+        # inRange already produces a single channel uint8 mask, which is all that findContours needs.
+        mask = cv2.inRange(self.frame, self.lower_bound, self.upper_bound)
         self.output = cv2.erode(
-            self.output, kernel, iterations=1)
+            mask, self.kernel, iterations=1)
         self.output = cv2.dilate(
-            self.output, kernel, iterations=3)
+            self.output, self.kernel, iterations=3)
 
     def extract_contours(self):
+        # Only the outer contours are used, and since OpenCV 3.2 the input image is not modified.
         _, self.contours, _ = cv2.findContours(
-            self.output.copy(), cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
-        maxArea, idx = 0, 0
+            self.output, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         if len(self.contours) == 0:
             self.foundContour = False
             return
         else:
             self.foundContour = True
 
-        for i in range(len(self.contours)):
-            area = cv2.contourArea(self.contours[i])
-            if area > maxArea:
-                maxArea = area
-                idx = i
-        self.realHandContour = self.contours[idx]
-        self.realHandLength = cv2.arcLength(self.realHandContour, True)
-        self.handContour = cv2.approxPolyDP(
-            self.realHandContour, 0.001 * self.realHandLength, True)
+        # CHAIN_APPROX_SIMPLE already drops redundant points, and approxPolyDP at 0.001 * arcLength removed
+        # next to nothing on top of that, so the largest contour is used as is.
+        self.handContour = max(self.contours, key=cv2.contourArea)
 
     def __check_stationary(self):
         search_len = 3
-        val = -1 * (search_len + 1)
         self.prev_record_state = self.record
         if self.can_do_gesture:
-            xPoints = [pt[0] for pt in self.movement_history[val:-1]]
-            yPoints = [pt[1] for pt in self.movement_history[val:-1]]
-            xAvg = np.average(xPoints)
-            yAvg = np.average(yPoints)
-            factor = 0.04
-            for [x, y] in self.movement_history[-(search_len + 1):-1]:
-                if (x-xAvg)**2 + (y-yAvg) > factor * \
-                                                min(self.cameraWidth, self.cameraHeight):
-                    if self.stationary:
-                        self.record = True
-                    self.stationary = False
-                    return
+            # the `search_len` positions before the most recent one.
+            points = self.movement_history.slice_range(1, search_len + 1).astype(np.float64)
+            offsets = points - points.mean(axis=0)
+            # compare squared distances from the average position against the squared threshold.
+            if (offsets * offsets).sum(axis=1).max() > self.stationaryThreshSq:
+                if self.stationary:
+                    self.record = True
+                self.stationary = False
+                return
             if not self.stationary:
                 self.record = False
             self.stationary = True
 
     def find_center(self):
+        # moments of the contour rather than of the whole mask, so stray blobs do not pull the center off the hand.
         self.moments = cv2.moments(self.handContour)
         if self.moments["m00"] != 0:
             self.handX = int(self.moments["m10"] / self.moments["m00"])
@@ -189,17 +232,17 @@ class Vision:
         self.window.add(self.handMoment)
         self.realX, self.realY = self.window[0]
         #  print('{}'.format(self.window.timestamp[0]))
-        self.movement_history += [(self.realX, self.realY)]
+        self.movement_history.add((self.realX, self.realY))
         self.__check_stationary()
 
     def move_cursor(self):
-        x = self.realX * (self.screen_width / self.frame.shape[1])
-        y = self.realY * (self.screen_height / self.frame.shape[0])
+        x = self.realX * self.cursorScaleX
+        y = self.realY * self.cursorScaleY
         # pyautogui.moveTo(x, y)
         return (x, y)
 
     def check_can_perform_gesture(self):
-        if len(self.movement_history) > 10:
+        if self.movement_history.added > 10:
             self.can_do_gesture = True
         else:
             self.can_do_gesture = False
@@ -225,10 +268,10 @@ class Vision:
 
     def determine_if_gesture(self):
         if self.record:
-            self.gesture_points += [self.movement_history[-1]]
+            self.gesture_points += [tuple(self.movement_history.at(0))]
         elif self.prev_record_state == True and not self.record:
             min_gesture_points = 5
-            if len(self.movement_history) > min_gesture_points:
+            if self.movement_history.added > min_gesture_points:
                 gesture_index = self.find_gesture()
                 if gesture_index != None:
                     print('Gesture Performed: {}'.format(self.gesture_names[gesture_index]))
@@ -239,10 +282,12 @@ class Vision:
             self.canvas, [self.handContour], 0, (0, 255, 0), 1)
         cv2.circle(self.canvas, tuple([self.realX, self.realY]),
                    10, (255, 0, 0), -2)
-        recent_positions = self.movement_history[-30:]
-        if len(recent_positions) != 0:
-            for i in range(len(recent_positions)):
-                cv2.circle(self.canvas, recent_positions[i], 5,
+        recent = min(self.movement_history.added, 30)
+        if recent != 0:
+            # oldest first, as the colour of each position depends on its age.
+            recent_positions = self.movement_history.slice_range(0, recent)[::-1]
+            for i in range(recent):
+                cv2.circle(self.canvas, tuple(recent_positions[i]), 5,
                            (25*i, 255, 25*i), -1)
 
     def frame_outputs(self):
@@ -251,6 +296,9 @@ class Vision:
         cv2.imshow('Canvas', self.canvas)
         pass
 
+    def release(self):
+        self.webcam.stop()
+
     def check_exit(self):
         if cv2.waitKey(1) & 0xFF is ord('q'):
             cv2.destroyAllWindows()
@@ -279,6 +327,7 @@ class Vision:
             if cv2.waitKey(1) & 0xFF is ord('q'):
                 break
         cv2.destroyAllWindows()
+        self.release()
 
     '''**************** METHODS BELOW ARE FOR HAND PALM TRACKING ****************'''
 
@@ -288,33 +337,20 @@ class Vision:
 
     def __calculate_convex_hull(self):
         self.convexHull = cv2.convexHull(self.handContour, returnPoints=False)
-        self.hullPoints = [self.handContour[i[0]] for i in self.convexHull]
-        self.hullPoints = np.array(self.hullPoints, dtype=np.int32)
+        # gather the hull vertices with a single index array instead of building a list of points.
+        self.hullPoints = self.handContour[self.convexHull[:, 0]]
         self.defects = cv2.convexityDefects(self.handContour, self.convexHull)
 
     def __ecludian_space_reduction(self):
-        scaleFactor = 0.3
-        reducedSize = np.array(self.handContour * scaleFactor, dtype=np.int32)
-        tx, ty, w, h = cv2.boundingRect(reducedSize)
-        maxPoint = None
-        maxRadius = 0
-        for x in range(w):
-            for y in range(h):
-                radius = cv2.pointPolygonTest(reducedSize, (tx+x, ty+y), True)
-                if radius > maxRadius:
-                    maxPoint = (tx+x, ty+y)
-                    maxRadius = radius
-        realCenter = np.array(np.array(maxPoint) / scaleFactor, dtype=np.int32)
-        error = int((1 / scaleFactor) * 1.5)
-        maxPoint = None
-        maxRadius = 0
-        for x in range(realCenter[0] - error, realCenter[0] + error):
-            for y in range(realCenter[1] - error, realCenter[1] + error):
-                radius = cv2.pointPolygonTest(self.handContour, (x, y), True)
-                if radius > maxRadius:
-                    maxPoint = (x, y)
-                    maxRadius = radius
-        return np.array(maxPoint)
+        # The palm center is the point inside the hand farthest from its edge. Rasterize the hand once and
+        # find that point with a distance transform rather than testing every pixel with pointPolygonTest.
+        x, y, w, h = cv2.boundingRect(self.handContour)
+        # pad by one pixel so distances are measured to the background on every side of the hand.
+        mask = np.zeros((h + 2, w + 2), np.uint8)
+        cv2.drawContours(mask, [self.handContour], -1, 255, cv2.FILLED, offset=(1 - x, 1 - y))
+        dist = cv2.distanceTransform(mask, cv2.DIST_L2, cv2.DIST_MASK_PRECISE)
+        row, col = np.unravel_index(dist.argmax(), dist.shape)
+        return np.array((x + col - 1, y + row - 1))
 
     def __find_palm_center(self):
         self.palmCenter = self.__ecludian_space_reduction()
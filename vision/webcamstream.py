@@ -0,0 +1,81 @@
+import time
+import cv2
+from threading import Thread, Condition
+
+
+class WebcamStream:
+    """
+    Captures frames from a `cv2.VideoCapture` device on a background thread.\n
+    `read` returns the next frame captured since the previous call, so processing of one frame overlaps
+    with the capture of the next and no frame is processed twice.
+    """
+    RETRY_DELAY = 0.1  # Seconds to wait before reading again after the device fails to deliver a frame.
+
+    def __init__(self, src=0):
+        self.__capture = cv2.VideoCapture(src)
+        # Only keep the newest frame queued in the driver so frames are never stale.
+        self.__capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.__condition = Condition()
+        self.__grabbed = False
+        self.__frame = None
+        # number of frames captured, and the number of the last frame handed out by `read`.
+        self.__count = 0
+        self.__read_count = 0
+        self.__running = False
+        self.__thread = None
+
+    def set(self, prop, value):
+        return self.__capture.set(prop, value)
+
+    def get(self, prop):
+        return self.__capture.get(prop)
+
+    def start(self):
+        """Read the first frame, then begin capturing on the background thread."""
+        if not self.__running:
+            self.__grabbed, self.__frame = self.__capture.read()
+            if self.__grabbed:
+                self.__count += 1
+            self.__running = True
+            self.__thread = Thread(target=self.__update, daemon=True)
+            self.__thread.start()
+        return self
+
+    def read(self, timeout=1.0):
+        """
+        Same return value as `cv2.VideoCapture.read`.\n
+        Blocks until a frame newer than the one returned by the previous call is captured.
+        If none arrives within `timeout` seconds, returns `False` with the last captured frame.
+        """
+        with self.__condition:
+            fresh = self.__condition.wait_for(
+                lambda: self.__count > self.__read_count or not self.__running, timeout)
+            if not fresh or self.__count == self.__read_count:
+                return False, self.__frame
+            self.__read_count = self.__count
+            return True, self.__frame
+
+    def stop(self):
+        """Stop the capture thread and release the device."""
+        with self.__condition:
+            self.__running = False
+            self.__condition.notify_all()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+        self.__capture.release()
+
+    def __update(self):
+        while self.__running:
+            # `read` allocates a new frame each time, so readers never see a frame being written.
+            grabbed, frame = self.__capture.read()
+            if not grabbed:
+                # the device stopped delivering frames (e.g. unplugged), so back off instead of spinning.
+                with self.__condition:
+                    self.__grabbed = False
+                time.sleep(self.RETRY_DELAY)
+                continue
+            with self.__condition:
+                self.__grabbed, self.__frame = grabbed, frame
+                self.__count += 1
+                self.__condition.notify_all()